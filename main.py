@@ -1,11 +1,17 @@
 from enum import Enum
-from typing import Callable, Tuple, List, Dict
+from typing import Callable, Tuple, List, Dict, Iterable, Iterator
+from collections.abc import Mapping
+from types import MappingProxyType
 from functools import wraps
-from collections import UserDict
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
+from bisect import bisect_left, insort
 import re
+import sys
 
 DATE_STR_PATTERN = "%d.%m.%Y"
+DATE_MATCH_PATTERN = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})\Z", re.ASCII)
+# Days to move a congratulation forward, indexed by weekday (Mon=0 ... Sun=6)
+WEEKEND_SHIFT = (0, 0, 0, 0, 0, 2, 1)
 
 
 class Command(Enum):
@@ -46,22 +52,40 @@ def input_error(func: Callable):
     return inner
 
 
+def normalize_name(name: str) -> str:
+    return sys.intern(name.strip().casefold())
+
+
 class Field:
+    __slots__ = ("_value",)
+
     def __init__(self, value):
+        self._value = None
         self.value = value
 
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, new_value) -> None:
+        self._value = new_value
+
     def __str__(self):
         return "" if self.value is None else str(self.value)
 
 
 class Name(Field):
-    pass
+    __slots__ = ()
 
 
 class Phone(Field):
-    MATCH_PATTERN = re.compile(r"^\d{10}$")
+    __slots__ = ("_owner",)
+    MATCH_PATTERN = re.compile(r"\d{10}\Z", re.ASCII)
 
     def __init__(self, value: str):
+        # Record holding this phone; told about in-place edits so its index stays current
+        self._owner: Record | None = None
         super().__init__(None)
         if value is not None:
             self.value = value
@@ -72,17 +96,20 @@ class Phone(Field):
 
     @value.setter
     def value(self, new_value: str) -> None:
-        if new_value is None:
-            self._value = None
-            return
-        if not isinstance(new_value, str):
-            raise TypeError("The telephone number must be a string")
-        if not self.MATCH_PATTERN.fullmatch(new_value):
-            raise ValueError("The telephone number must contain exactly 10 digits")
+        if new_value is not None:
+            if not isinstance(new_value, str):
+                raise TypeError("The telephone number must be a string")
+            if len(new_value) != 10 or not self.MATCH_PATTERN.match(new_value):
+                raise ValueError("The telephone number must contain exactly 10 digits")
+        old_value = self._value
         self._value = new_value
+        if self._owner is not None:
+            self._owner._phone_changed(self, old_value)
 
 
 class Birthday(Field):
+    __slots__ = ("_formatted",)
+
     def __init__(self, value: str):
         super().__init__(None)
         if value is not None:
@@ -96,112 +123,218 @@ class Birthday(Field):
     def value(self, new_value: str):
         if new_value is None:
             self._value = None
+            self._formatted = None
             return
         if not isinstance(new_value, str):
             raise TypeError("The birthday date must be a string")
         try:
-            d = datetime.strptime(new_value, DATE_STR_PATTERN).date()
+            if len(new_value) == 10 and new_value[4] == "-" and new_value[7] == "-":
+                # ISO-8601 (YYYY-MM-DD), common in imported data
+                d = date.fromisoformat(new_value)
+            elif m := DATE_MATCH_PATTERN.match(new_value):
+                d = date(int(m[3]), int(m[2]), int(m[1]))
+            else:
+                # Slow path for loose inputs like "1.2.2000" that strptime accepts
+                d = datetime.strptime(new_value, DATE_STR_PATTERN).date()
         except ValueError as exc:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY") from exc
+            raise ValueError("Invalid date format. Use DD.MM.YYYY or YYYY-MM-DD") from exc
         self._value = d
+        self._formatted = f"{d.day:02d}.{d.month:02d}.{d.year:04d}"
+
+    @property
+    def formatted(self) -> str | None:
+        return self._formatted
 
 
 class Record:
+    __slots__ = ("name", "phones", "_phone_index", "_birthday", "_book")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones: List[Phone] = []
-        self.birthday: Birthday | None = None
+        self._phone_index: Dict[str, Phone] = {}
+        self._birthday: Birthday | None = None
+        # Address book holding this record, reindexed whenever the birthday is replaced
+        self._book: AddressBook | None = None
+
+    @property
+    def birthday(self) -> Birthday | None:
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, birthday: Birthday | None) -> None:
+        self._birthday = birthday
+        if self._book is not None:
+            self._book._index_birthday(self)
 
-    def add_phone(self, value: str) -> None:
-        self.phones.append(Phone(value))
+    def add_phone(self, value: str) -> bool:
+        if value in self._phone_index:
+            return False
+        phone = Phone(value)
+        phone._owner = self
+        self.phones.append(phone)
+        self._phone_index[value] = phone
+        return True
 
     def remove_phone(self, value: str) -> bool:
-        phone = self.find_phone(value)
+        phone = self._phone_index.pop(value, None)
         if phone is None:
             return False
+        phone._owner = None
         self.phones.remove(phone)
         return True
 
     def edit_phone(self, old_value: str, new_value: str) -> bool:
-        phone = self.find_phone(old_value)
+        phone = self._phone_index.get(old_value)
         if phone is None:
             return False
         phone.value = new_value
         return True
 
     def find_phone(self, value: str) -> Phone | None:
-        for phone in self.phones:
-            if phone.value == value:
-                return phone
-        return None
+        return self._phone_index.get(value)
+
+    def _phone_changed(self, phone: Phone, old_value: str) -> None:
+        if self._phone_index.get(old_value) is phone:
+            del self._phone_index[old_value]
+        duplicate = self._phone_index.get(phone.value)
+        if duplicate is not None and duplicate is not phone:
+            # Edited onto a number the record already has; keep only the edited phone
+            duplicate._owner = None
+            self.phones.remove(duplicate)
+        self._phone_index[phone.value] = phone
 
     def add_birthday(self, value: str) -> None:
         self.birthday = Birthday(value)
 
     def __str__(self):
-        phones = "; ".join(p.value for p in self.phones) if self.phones else "—"
-        bday_val = self.birthday.value if self.birthday else None
-        bday = bday_val.strftime(DATE_STR_PATTERN) if bday_val else "—"
+        phones = "; ".join([p.value for p in self.phones]) if self.phones else "—"
+        bday = (self._birthday.formatted if self._birthday else None) or "—"
         return f"Contact name: {self.name.value}, phones: {phones}, birthday: {bday}"
 
 
-class AddressBook(UserDict):
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _month_day_key(month: int, day: int) -> int:
+    return month * 32 + day
+
+
+# 29 February sits just before 1 March in key order and is celebrated then in non-leap years
+LEAP_DAY_KEY = _month_day_key(2, 29)
+
+
+class AddressBook(Mapping):
+    def __init__(self, records: Iterable[Record] = ()):
+        self._records: Dict[str, Record] = {}
+        self._bday_index: Dict[str, int] = {}
+        # (month-day key, record key) pairs kept sorted for range lookups
+        self._by_monthday: List[Tuple[int, str]] = []
+        # Read-only view of the records; change them through add_record/delete
+        self.data: Mapping[str, Record] = MappingProxyType(self._records)
+        for record in records:
+            self.add_record(record)
+
+    def __getitem__(self, key: str) -> Record:
+        return self._records[key]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
     def add_record(self, record: Record) -> None:
-        key = record.name.value.strip().lower()
-        self.data[key] = record
+        key = normalize_name(record.name.value)
+        self._detach(key)
+        self._records[key] = record
+        record._book = self
+        self._index_birthday(record)
 
     def find(self, name: str) -> Record | None:
-        norm = name.strip().lower()
-        return self.data.get(norm)
+        norm = normalize_name(name)
+        return self._records.get(norm)
 
     def delete(self, name: str) -> None:
-        normalized_name = name.strip().lower()
-        if normalized_name in self.data:
-            del self.data[normalized_name]
+        normalized_name = normalize_name(name)
+        if normalized_name in self._records:
+            self._detach(normalized_name)
+            del self._records[normalized_name]
+
+    def _detach(self, key: str) -> None:
+        record = self._records.get(key)
+        if record is not None:
+            record._book = None
+        self._unindex_birthday(key)
+
+    def _key_of(self, record: Record) -> str:
+        key = normalize_name(record.name.value)
+        if self._records.get(key) is record:
+            return key
+        # Renamed after it was added; it is still stored under its old key
+        return next(k for k, r in self._records.items() if r is record)
+
+    def _index_birthday(self, record: Record) -> None:
+        key = self._key_of(record)
+        self._unindex_birthday(key)
+        if record.birthday is None or record.birthday.value is None:
+            return
+        bday: date = record.birthday.value
+        md_key = _month_day_key(bday.month, bday.day)
+        self._bday_index[key] = md_key
+        insort(self._by_monthday, (md_key, key))
+
+    def _unindex_birthday(self, key: str) -> None:
+        md_key = self._bday_index.pop(key, None)
+        if md_key is None:
+            return
+        del self._by_monthday[bisect_left(self._by_monthday, (md_key, key))]
 
     def get_upcoming_birthdays(self) -> List[Dict[str, str]]:
         result: List[Dict[str, str]] = []
-        now = datetime.today().date()
-
-        for _, value in self.data.items():
-            if value.birthday is None or value.birthday.value is None:
+        today_ord = date.today().toordinal()  # read once; the whole window hangs off it
+        by_monthday = self._by_monthday
+
+        for cand_ord in range(today_ord, today_ord + 8):
+            candidate = date.fromordinal(cand_ord)
+            md_key = _month_day_key(candidate.month, candidate.day)
+            lo_key = md_key
+            if candidate.month == 3 and candidate.day == 1 and not _is_leap(candidate.year):
+                lo_key = LEAP_DAY_KEY
+            start = bisect_left(by_monthday, (lo_key,))
+            end = bisect_left(by_monthday, (md_key + 1,))
+            if start == end:
                 continue
 
-            bday: date = value.birthday.value
-            candidate = date(now.year, bday.month, bday.day)
-            if candidate < now:
-                candidate = date(now.year + 1, bday.month, bday.day)
-
-            if candidate.weekday() == 5:  # Saturday
-                adjusted = candidate + timedelta(days=2)
-            elif candidate.weekday() == 6:  # Sunday
-                adjusted = candidate + timedelta(days=1)
-            else:
-                adjusted = candidate
-
-            diff_date = (candidate - now).days
-            if 0 <= diff_date <= 7:
+            adjusted = date.fromordinal(cand_ord + WEEKEND_SHIFT[candidate.weekday()])
+            congratulation_date = adjusted.isoformat()
+            for _, key in by_monthday[start:end]:
                 result.append(
                     {
-                        "name": value.name.value,
-                        "congratulation_date": adjusted.strftime("%Y-%m-%d"),
+                        "name": self._records[key].name.value,
+                        "congratulation_date": congratulation_date,
                     }
                 )
 
         return result
 
     def __str__(self):
-        if not self.data:
+        if not self._records:
             return "No contacts yet"
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(map(str, self._records.values()))
 
 
 @input_error
 def parse_command(user_input: str) -> Tuple[str, ...]:
-    user_input = user_input.strip()
-    cmd, *args = user_input.split()
-    cmd = cmd.strip().upper()
-    return (cmd, *args)
+    head, *tail = user_input.split(None, 1)
+    cmd = head.upper()
+    if not tail:
+        return (cmd,)
+    return (cmd, *tail[0].split())
 
 
 def to_dashed(text: str) -> str:
@@ -218,7 +351,8 @@ def add_contact(args, book: AddressBook) -> str:
         record = Record(name)
         book.add_record(record)
         message = "Contact added."
-    record.add_phone(phone)
+    if not record.add_phone(phone):
+        return "Phone already exists."
     return message
 
 
@@ -249,7 +383,7 @@ def show_all(book: AddressBook) -> str:
 @input_error
 def add_birthday(args, book: AddressBook) -> str:
     if len(args) < 2:
-        raise ValueError("Format: add-birthday <name> <DD.MM.YYYY>")
+        raise ValueError("Format: add-birthday <name> <DD.MM.YYYY | YYYY-MM-DD>")
     name, birthday, *_ = args
     record = book.find(name)
     record.add_birthday(birthday)
@@ -264,9 +398,10 @@ def show_birthday(args, book: AddressBook) -> str:
     record = book.find(name)
     if record.birthday is None or record.birthday.value is None:
         return "No birthday set."
-    return record.birthday.value.strftime(DATE_STR_PATTERN)
+    return record.birthday.formatted
 
 
+@input_error
 def show_nearest_birthdays(book: AddressBook) -> str:
     items = book.get_upcoming_birthdays()
     if not items:
@@ -278,41 +413,61 @@ def show_nearest_birthdays(book: AddressBook) -> str:
     return "\n".join(lines)
 
 
+def show_greeting(args, book: AddressBook) -> str:
+    return "How can I help you?"
+
+
+def show_unknown(args, book: AddressBook) -> str:
+    return "Unknown command. Available: " + ", ".join(c.name.lower() for c in Command)
+
+
+COMMAND_BY_TOKEN: Dict[str, Command] = {to_dashed(c.name): c for c in Command}
+
+COMMAND_HANDLERS: Dict[Command, Callable | None] = {
+    Command.HELLO: show_greeting,
+    Command.ADD: add_contact,
+    Command.CHANGE: change_contact,
+    Command.PHONE: show_phone,
+    Command.ALL: lambda args, book: show_all(book),
+    Command.ADD_BIRTHDAY: add_birthday,
+    Command.SHOW_BIRTHDAY: show_birthday,
+    Command.BIRTHDAYS: lambda args, book: show_nearest_birthdays(book),
+    Command.CLOSE: None,
+    Command.EXIT: None,
+}
+
+
 @input_error
 def main() -> None:
     book = AddressBook()
-    print("Welcome to the assistant bot!")
+    stdin = sys.stdin
+    stdout_write = sys.stdout.write
+    # Piped input needs no prompt flushing; let the buffer batch the output
+    flush = sys.stdout.flush if stdin.isatty() else lambda: None
+    stdout_write("Welcome to the assistant bot!\n")
 
     while True:
-        user_input = input("Enter a command ")
+        stdout_write("Enter a command ")
+        flush()
+        user_input = stdin.readline()
+        if not user_input:
+            break
         parsed = parse_command(user_input)
 
         if isinstance(parsed, str):
-            print(parsed)
+            stdout_write(parsed)
+            stdout_write("\n")
             continue
 
         command, *args = parsed
 
-        if command in {Command.CLOSE.name, Command.EXIT.name}:
+        handler = COMMAND_HANDLERS.get(COMMAND_BY_TOKEN.get(command), show_unknown)
+        if handler is None:
             break
-        elif command == Command.ADD.name:
-            print(add_contact(args, book))
-        elif command == Command.PHONE.name:
-            print(show_phone(args, book))
-        elif command == Command.CHANGE.name:
-            print(change_contact(args, book))
-        elif command == Command.ALL.name:
-            print(show_all(book))
-        elif command == to_dashed(Command.ADD_BIRTHDAY.name):
-            print(add_birthday(args, book))
-        elif command == Command.BIRTHDAYS.name:
-            print(show_nearest_birthdays(book))
-        elif command == to_dashed(Command.SHOW_BIRTHDAY.name):
-            print(show_birthday(args, book))
-        elif command == Command.HELLO.name:
-            print("How can I help you?")
-        else:
-            print("Unknown command. Available: " + ", ".join(c.name.lower() for c in Command))
+        stdout_write(handler(args, book))
+        stdout_write("\n")
+
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":